@@ -16,18 +16,42 @@ script.
 """
 
 import os
+import queue
+import re
 import signal
 import subprocess
 import sys
 import threading
+import time
 import mpdcontrol
 import logging
+import logging.handlers
 
-from RPi import GPIO
-from queue import Queue
+import pigpio
+
+# pyalsaaudio lets us talk to the mixer in-process: a couple of ioctls per
+# volume change instead of a fork+exec of amixer on every knob click. If it
+# isn't installed we fall back to shelling out like before.
+try:
+  import alsaaudio
+except ImportError:
+  alsaaudio = None
 
 BOUNCETIME = 400
 
+# Glitch filter length for the push buttons, in microseconds. pigpio only
+# reports an edge once the level has been *stable* for this long, so it
+# must stay far below the length of a human tap (~100 ms) — it only needs
+# to outlast contact bounce spikes. The much longer BOUNCETIME suppression
+# happens in software after a press has been accepted.
+BUTTON_GLITCH_US = 5000
+
+# How long (in seconds) the nav handler waits after the first edge before
+# reading which pin is held down — just enough for the rocker to finish
+# rolling onto its final contact. This adds straight to the perceived
+# latency of a press, so keep it small.
+NAV_SETTLE = 0.02
+
 DEBUG = False
 
 # SETTINGS
@@ -65,34 +89,90 @@ VOLUME_INCREMENT = 2
 #
 
 
-# When the knob is turned, the callback happens in a separate thread. If
-# those turn callbacks fire erratically or out of order, we'll get confused
-# about which direction the knob is being turned, so we'll use a queue to
-# enforce FIFO. The callback will push onto a queue, and all the actual
-# volume-changing will happen in the main thread.
-RotEncQUEUE = Queue()
-NavQueue = Queue()
-
-# When we put something in the queue, we'll use an event to signal to the
-# main thread that there's something in there. Then the main thread will
-# process the queue and reset the event. If the knob is turned very quickly,
-# this event loop will fall behind, but that's OK because it consumes the
-# queue completely each time through the loop, so it's guaranteed to catch up.
-EVENT = threading.Event()
-
-def debug(str):
-  if not DEBUG:
-    return
-  print(str)
+# When the knob is turned or a button is pressed, the callback happens in a
+# separate thread. If those callbacks fire erratically or out of order, we'll
+# get confused about which direction the knob is being turned, so we'll use a
+# queue to enforce FIFO. The callbacks push tagged ("kind", payload) tuples
+# onto the queue, and all the actual volume-changing will happen in the main
+# thread, which just blocks on get(). SimpleQueue is implemented in C and
+# needs no extra Event object to signal "something is in there", so there's
+# no window where a callback can fire between draining and clearing a flag.
+EVENTS = queue.SimpleQueue()
+
+# Pick the debug implementation once at import time instead of testing
+# DEBUG on every call. Hot-path callers additionally guard with `if DEBUG:`
+# so that even the argument formatting is skipped in production.
+if DEBUG:
+  def debug(s):
+    print(s)
+else:
+  def debug(s):
+    pass
+
+logger = logging.getLogger(__name__)
+
+# Ben Buxton's full-step quadrature state machine, flattened into a lookup
+# table indexed by (state << 2) | (levelB << 1) | levelA. That phase order
+# matters: it keeps the direction mapping of the original edge cascade,
+# where the rotation that raises A last (with B already high) is +1, i.e.
+# turning the knob right raises the volume. Each entry is the
+# next state, with bit 4 or 5 set when a full, valid detent transition has
+# completed clockwise or counter-clockwise. Bounced edges just shuffle
+# between the intermediate states and never emit a tick, so no bouncetime is
+# needed on the encoder pins.
+_R_START     = 0x0
+_R_CW_FINAL  = 0x1
+_R_CW_BEGIN  = 0x2
+_R_CW_NEXT   = 0x3
+_R_CCW_BEGIN = 0x4
+_R_CCW_FINAL = 0x5
+_R_CCW_NEXT  = 0x6
+
+_DIR_CW  = 0x10
+_DIR_CCW = 0x20
+
+_STATE_TABLE = bytes((
+  # R_START
+  _R_START,    _R_CW_BEGIN,  _R_CCW_BEGIN, _R_START,
+  # R_CW_FINAL
+  _R_CW_NEXT,  _R_START,     _R_CW_FINAL,  _R_START | _DIR_CW,
+  # R_CW_BEGIN
+  _R_CW_NEXT,  _R_CW_BEGIN,  _R_START,     _R_START,
+  # R_CW_NEXT
+  _R_CW_NEXT,  _R_CW_BEGIN,  _R_CW_FINAL,  _R_START,
+  # R_CCW_BEGIN
+  _R_CCW_NEXT, _R_START,     _R_CCW_BEGIN, _R_START,
+  # R_CCW_FINAL
+  _R_CCW_NEXT, _R_CCW_FINAL, _R_START,     _R_START | _DIR_CCW,
+  # R_CCW_NEXT
+  _R_CCW_NEXT, _R_CCW_FINAL, _R_CCW_BEGIN, _R_START,
+))
+
+def _setup_inputs(pi, pins, glitch):
+  """
+  Configure a group of pins as pulled-up inputs sharing one glitch filter
+  setting.
+  """
+  for pin in pins:
+    pi.set_mode(pin, pigpio.INPUT)
+    pi.set_pull_up_down(pin, pigpio.PUD_UP)
+    pi.set_glitch_filter(pin, glitch)
 
 class RotaryEncoder:
   """
   A class to decode mechanical rotary encoder pulses.
 
-  Ported to RPi.GPIO from the pigpio sample here:
+  Uses pigpio, whose daemon delivers hardware-timestamped edges with far
+  lower and more uniform latency than RPi.GPIO's userspace epoll loop, so
+  fast spins no longer drop counts. Based on the pigpio sample here:
   http://abyz.co.uk/rpi/pigpio/examples.html
   """
 
+  # Attribute access in _callback happens on every edge; slots make it a
+  # fixed offset instead of a dict lookup (and drop the per-instance dict).
+  __slots__ = ('gpioA', 'gpioB', 'callback', 'gpioButton', 'buttonCallback',
+               'pi', 'state', '_levA', '_levB', '_cbA', '_cbB', '_cbButton')
+
   def __init__(self, gpioA, gpioB, callback=None, buttonPin=None, buttonCallback=None):
     """
     Instantiate the class. Takes three arguments: the two pin numbers to
@@ -105,7 +185,6 @@ class RotaryEncoder:
     yet which one is which.
     """
 
-    self.lastGpio = None
     self.gpioA    = gpioA
     self.gpioB    = gpioB
     self.callback = callback
@@ -113,53 +192,65 @@ class RotaryEncoder:
     self.gpioButton     = buttonPin
     self.buttonCallback = buttonCallback
 
-    self.levA = 0
-    self.levB = 0
+    self.pi = pigpio.pi()
+
+    # A tiny glitch filter eats sub-millisecond contact bounce spikes in the
+    # daemon itself, before they ever reach Python. The state machine copes
+    # with anything slower.
+    _setup_inputs(self.pi, (self.gpioA, self.gpioB), 1000)
 
-    GPIO.setmode(GPIO.BCM)
-    GPIO.setup(self.gpioA, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-    GPIO.setup(self.gpioB, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+    # Decoder state machine, see _STATE_TABLE above. Every callback tells us
+    # the new level of the pin that moved, so we keep both levels cached and
+    # never have to read a pin (a round-trip to the pigpio daemon) per edge.
+    self.state = _R_START
+    self._levA = self.pi.read(self.gpioA)
+    self._levB = self.pi.read(self.gpioB)
 
-    GPIO.add_event_detect(self.gpioA, GPIO.BOTH, self._callback)
-    GPIO.add_event_detect(self.gpioB, GPIO.BOTH, self._callback)
+    self._cbA = self.pi.callback(self.gpioA, pigpio.EITHER_EDGE, self._callback)
+    self._cbB = self.pi.callback(self.gpioB, pigpio.EITHER_EDGE, self._callback)
 
+    self._cbButton = None
     if self.gpioButton:
-      GPIO.setup(self.gpioButton, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-      GPIO.add_event_detect(self.gpioButton, GPIO.FALLING, self._buttonCallback, bouncetime=BOUNCETIME)
+      _setup_inputs(self.pi, (self.gpioButton,), BUTTON_GLITCH_US)
+      self._cbButton = self.pi.callback(self.gpioButton, pigpio.FALLING_EDGE, self._buttonCallback)
 
 
   def destroy(self):
-    GPIO.remove_event_detect(self.gpioA)
-    GPIO.remove_event_detect(self.gpioB)
-    #GPIO.cleanup()
-
-  def _buttonCallback(self, channel):
-    self.buttonCallback(GPIO.input(channel))
-
-  def _callback(self, channel):
-    level = GPIO.input(channel)
-    if channel == self.gpioA:
-      self.levA = level
+    self._cbA.cancel()
+    self._cbB.cancel()
+    if self._cbButton is not None:
+      self._cbButton.cancel()
+    self.pi.stop()
+
+  def _buttonCallback(self, gpio, level, tick):
+    self.buttonCallback(level)
+
+  def _callback(self, gpio, level, tick):
+    # One table lookup per edge: update the cached level of whichever pin
+    # moved, feed the combined pin state into the Buxton state machine and
+    # emit a tick only when a full detent transition has completed. See
+    # _STATE_TABLE above for the encoding. This fires for every edge on a
+    # fast spin, so each attribute is touched exactly once and the rest of
+    # the work happens on locals.
+    if gpio == self.gpioA:
+      self._levA = levA = level
+      levB = self._levB
     else:
-      self.levB = level
-
-    # Debounce.
-    if channel == self.lastGpio:
-      return
-
-    # When both inputs are at 1, we'll fire a callback. If A was the most
-    # recent pin set high, it'll be forward, and if B was the most recent pin
-    # set high, it'll be reverse.
-    self.lastGpio = channel
-    if channel == self.gpioA and level == 1:
-      if self.levB == 1:
-        self.callback(1)
-    elif channel == self.gpioB and level == 1:
-      if self.levA == 1:
-        self.callback(-1)
+      levA = self._levA
+      self._levB = levB = level
+    state = _STATE_TABLE[((self.state & 0x07) << 2) | (levB << 1) | levA]
+    self.state = state
+    direction = state & 0x30
+    if direction == _DIR_CW:
+      self.callback(1)
+    elif direction == _DIR_CCW:
+      self.callback(-1)
 
 class NavButton:
 
+  __slots__ = ('gpioLeft', 'gpioRight', 'gpioUp', 'gpioDown', 'callback',
+               'pi', '_lock', '_pending', '_trigger', '_last_ns', '_cbs')
+
   def __init__(self, gpioLeft, gpioRight, gpioUp, gpioDown, callback=None):
     """
     Instantiate the class.
@@ -171,27 +262,79 @@ class NavButton:
 
     self.callback = callback
 
-    GPIO.setmode(GPIO.BCM)
-    GPIO.setup(self.gpioLeft, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-    GPIO.setup(self.gpioRight, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-    GPIO.setup(self.gpioUp, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-    GPIO.setup(self.gpioDown, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-
-    GPIO.add_event_detect(self.gpioLeft, GPIO.FALLING, self._callback,bouncetime=BOUNCETIME)
-    GPIO.add_event_detect(self.gpioRight, GPIO.FALLING, self._callback,bouncetime=BOUNCETIME)
-    GPIO.add_event_detect(self.gpioUp, GPIO.FALLING, self._callback,bouncetime=BOUNCETIME)
-    GPIO.add_event_detect(self.gpioDown, GPIO.FALLING, self._callback,bouncetime=BOUNCETIME)
+    # Guards _pending: a Timer that is scheduled on the first falling edge
+    # of a gesture and reads all four pins once the rocker has settled.
+    # _trigger remembers which pin started the gesture in case the press is
+    # already over by the time the timer reads.
+    self._lock = threading.Lock()
+    self._pending = None
+    self._trigger = None
+
+    # Monotonic timestamp of the last gesture we actually dispatched. The
+    # glitch filter below only suppresses short spikes on the same pin; this
+    # guards against a late bounce on a neighbouring pin starting a whole
+    # new gesture right after we accepted one.
+    self._last_ns = 0
+
+    self.pi = pigpio.pi()
+
+    _setup_inputs(self.pi,
+                  (self.gpioLeft, self.gpioRight, self.gpioUp, self.gpioDown),
+                  BUTTON_GLITCH_US)
+
+    # All four pins share one handler. The first edge of a gesture arms a
+    # timer; any further edges while it is armed (bounce, or the rocker
+    # rolling over a neighbouring contact) are swallowed, so one gesture
+    # costs one Python callback instead of up to four.
+    self._cbs = [
+      self.pi.callback(self.gpioLeft, pigpio.FALLING_EDGE, self._combined),
+      self.pi.callback(self.gpioRight, pigpio.FALLING_EDGE, self._combined),
+      self.pi.callback(self.gpioUp, pigpio.FALLING_EDGE, self._combined),
+      self.pi.callback(self.gpioDown, pigpio.FALLING_EDGE, self._combined),
+    ]
 
   def destroy(self):
-    GPIO.remove_event_detect(self.gpioLeft)
-    GPIO.remove_event_detect(self.gpioRight)
-    GPIO.remove_event_detect(self.gpioUp)
-    GPIO.remove_event_detect(self.gpioDown)
-    GPIO.cleanup()
-
-
-  def _callback(self, channel):
-    self.callback(channel)
+    for cb in self._cbs:
+      cb.cancel()
+    with self._lock:
+      if self._pending is not None:
+        self._pending.cancel()
+        self._pending = None
+    self.pi.stop()
+
+
+  def _combined(self, gpio, level, tick):
+    with self._lock:
+      if self._pending is not None:
+        return
+      if time.monotonic_ns() - self._last_ns < BOUNCETIME * 1000000:
+        return
+      self._trigger = gpio
+      self._pending = threading.Timer(NAV_SETTLE, self._settled)
+      self._pending.daemon = True
+      self._pending.start()
+
+  def _settled(self):
+    with self._lock:
+      self._pending = None
+      trigger = self._trigger
+    # The rocker has had NAV_SETTLE to finish rolling onto its final
+    # contact; whichever pin is held low now is the one the user meant. If
+    # none is low the press was just very quick — the glitch filter only
+    # reports edges that were stable, so the triggering pin was a real
+    # press and still counts.
+    for pin in (self.gpioLeft, self.gpioRight, self.gpioUp, self.gpioDown):
+      if self.pi.read(pin) == 0:
+        self._last_ns = time.monotonic_ns()
+        self.callback(pin)
+        return
+    self._last_ns = time.monotonic_ns()
+    self.callback(trigger)
+
+# `amixer get` reports the volume and the mute state on one line as
+# "[NN%] ... [on]" or "[NN%] ... [off]". Matching the raw bytes directly
+# saves decoding output we never look at.
+_MIXER_RE = re.compile(rb'\[(\d+)%\].*\[(on|off)\]')
 
 class VolumeError(Exception):
   pass
@@ -200,15 +343,26 @@ class Volume:
   """
   A wrapper API for interacting with the volume settings on the RPi.
   """
+  __slots__ = ('last_volume', 'is_muted', 'volume', '_mixer', '_sync_ts')
+
   MIN = VOLUME_MIN
   MAX = VOLUME_MAX
   INCREMENT = VOLUME_INCREMENT
 
+  # How long (in seconds) a reading of the mixer state stays trustworthy.
+  # We're the only thing changing the mixer, so this mostly exists to catch
+  # somebody fiddling with alsamixer behind our back.
+  SYNC_TTL = 0.5
+
   def __init__(self):
     # Set an initial value for last_volume in case we're muted when we start.
     self.last_volume = self.MIN
     self.is_muted = True
     self.volume = 0
+    # Open the mixer once and keep it; every volume change is then just a
+    # couple of ioctls on the already-open control device.
+    self._mixer = alsaaudio.Mixer('PCM') if alsaaudio else None
+    self._sync_ts = 0.0
     self._sync()
 
   def up(self):
@@ -232,24 +386,47 @@ class Volume:
     """
     Sets volume to a specific value.
     """
-    self.volume = self._constrain(v)
-    output = self.amixer("set 'PCM' unmute {}%".format(v))
-    #self._sync(output)
+    new_volume = self._constrain(v)
+    if new_volume == self.volume and not self.is_muted:
+      # Nothing would change — typically the knob being spun past MIN or
+      # MAX — so don't bother the mixer at all.
+      return self.volume
+    self.volume = new_volume
+    if self._mixer:
+      self._mixer.setvolume(self.volume)
+      self._mixer.setmute(0)
+    else:
+      self.amixer(["set", "PCM", "unmute", "{}%".format(self.volume)])
+    self.is_muted = False
+    # We just wrote the value ourselves, so there's nothing to read back.
+    self._sync_ts = time.monotonic()
     return self.volume
 
   def toggle(self):
     """
     Toggles muting between on and off.
     """
-    if self.is_muted:
-      output = self.amixer("set 'PCM' unmute")
-    else:
+    # Revalidate the cached state first (a no-op within the TTL) so we
+    # toggle relative to reality if someone changed the mixer behind our
+    # back.
+    self._sync()
+
+    if not self.is_muted:
       # We're about to mute ourselves, so we should remember the last volume
       # value we had because we'll want to restore it later.
       self.last_volume = self.volume
-      output = self.amixer("set 'PCM' mute")
 
-    self._sync(output)
+    if self._mixer:
+      self._mixer.setmute(0 if self.is_muted else 1)
+    else:
+      self.amixer(["set", "PCM", "unmute" if self.is_muted else "mute"])
+
+    # We know what the write just did, so flip the flag optimistically
+    # instead of reading the state back; _sync will validate it lazily once
+    # the TTL expires.
+    self.is_muted = not self.is_muted
+    self._sync_ts = time.monotonic()
+
     if not self.is_muted:
       # If we just unmuted ourselves, we should restore whatever volume we
       # had previously.
@@ -257,46 +434,43 @@ class Volume:
     return self.is_muted
 
   def status(self):
+    self._sync()
     if self.is_muted:
       return "{}% (muted)".format(self.volume)
     return "{}%".format(self.volume)
 
-  # Read the output of `amixer` to get the system volume and mute state.
+  # Read the system volume and mute state back from the mixer.
   #
-  # This is designed not to do much work because it'll get called with every
-  # click of the knob in either direction, which is why we're doing simple
-  # string scanning and not regular expressions.
+  # With pyalsaaudio this is two ioctls. The fallback runs one precompiled
+  # regex over the raw output of `amixer`, because this can get called with
+  # every click of the knob in either direction.
   def _sync(self, output=None):
-    if output is None:
-      doparsing=True
-      try:
-        output = self.amixer("get 'PCM'")
-      except:
-        doparsing=False
-        pass
-
-    if doparsing:
-      lines = output.readlines()
-      if DEBUG:
-        strings = [line.decode('utf8') for line in lines]
-        debug("OUTPUT:")
-        debug("".join(strings))
-      last = lines[-1].decode('utf-8')
-
-      # The last line of output will have two values in square brackets. The
-      # first will be the volume (e.g., "[95%]") and the second will be the
-      # mute state ("[off]" or "[on]").
-      i1 = last.rindex('[') + 1
-      i2 = last.rindex(']')
-
-      self.is_muted = last[i1:i2] == 'off'
+    # Trust a recent reading (or one of our own writes) instead of asking
+    # the mixer again on every call.
+    if output is None and time.monotonic() - self._sync_ts < self.SYNC_TTL:
+      return
 
-      i1 = last.index('[') + 1
-      i2 = last.index('%')
-      # In between these two will be the percentage value.
-      pct = last[i1:i2]
+    if self._mixer:
+      self.volume = self._mixer.getvolume()[0]
+      self.is_muted = bool(self._mixer.getmute()[0])
+      self._sync_ts = time.monotonic()
+      return
 
-      self.volume = int(pct)
+    if output is None:
+      try:
+        output = self.amixer(["get", "PCM"])
+      except VolumeError:
+        # Leave the cached state alone; we'll retry once the TTL expires.
+        return
+
+    if DEBUG:
+      debug("OUTPUT:")
+      debug(output.decode('utf8'))
+    m = _MIXER_RE.search(output)
+    if m:
+      self.volume = int(m.group(1))
+      self.is_muted = m.group(2) == b'off'
+      self._sync_ts = time.monotonic()
 
   # Ensures the volume value is between our minimum and maximum.
   def _constrain(self, v):
@@ -306,90 +480,172 @@ class Volume:
       return self.MAX
     return v
 
-  def amixer(self, cmd):
-    p = subprocess.Popen("amixer {}".format(cmd), shell=True, stdout=subprocess.PIPE)
-    code = p.wait()
-    if code != 0:
-      raise VolumeError("Unknown error")
+  def amixer(self, args):
+    p = subprocess.run(["amixer"] + args, stdout=subprocess.PIPE)
+    if p.returncode != 0:
+      raise VolumeError("amixer {} exited with status {}".format(" ".join(args), p.returncode))
 
     return p.stdout
 
 def main():
 
-  logging.basicConfig(filename='/home/pi/hoerkoffer.log',
-                      format='%(asctime)s %(levelname)7s %(module)12s %(funcName)s %(message)s', level=logging.DEBUG)
+  # Log records are enqueued from whatever thread emits them and written to
+  # the file by a dedicated listener thread, so a slow SD card write never
+  # stalls a GPIO callback or the main loop.
+  log_queue = queue.SimpleQueue()
+  file_handler = logging.FileHandler('/home/pi/hoerkoffer.log')
+  file_handler.setFormatter(logging.Formatter(
+      '%(asctime)s %(levelname)7s %(module)12s %(funcName)s %(message)s'))
+  root = logging.getLogger()
+  root.setLevel(logging.DEBUG)
+  root.addHandler(logging.handlers.QueueHandler(log_queue))
+  listener = logging.handlers.QueueListener(log_queue, file_handler)
+  listener.start()
 
   gpioA = GPIO_A
   gpioB = GPIO_B
   gpioButton = GPIO_BUTTON
 
   v = Volume()
-  logging.debug('Generate MpdControl object')
+  logger.debug('Generate MpdControl object')
   mpdObj = mpdcontrol.MpdControl()
 
+  # The mpd client is not thread-safe, and the keepalive thread below talks
+  # to it concurrently with the main loop.
+  mpd_lock = threading.Lock()
+
+  def mpd_reconnect():
+    # MpdControl connects in its constructor, so a fresh instance is our
+    # reconnect path when mpd restarted or dropped the socket. Returns
+    # whether we got a working connection back.
+    nonlocal mpdObj
+    try:
+      with mpd_lock:
+        mpdObj = mpdcontrol.MpdControl()
+      return True
+    except Exception:
+      logger.debug("mpd reconnect failed", exc_info=True)
+      return False
+
+  # Keep the mpd socket warm so a button press doesn't pay the reconnect
+  # latency after mpd's idle timeout closes the connection on us.
+  def mpd_keepalive():
+    while True:
+      time.sleep(25)
+      try:
+        with mpd_lock:
+          mpdObj.client.ping()
+      except Exception:
+        logger.debug("mpd ping failed", exc_info=True)
+        mpd_reconnect()
+
+  threading.Thread(target=mpd_keepalive, daemon=True).start()
+
   def on_press(value):
+    EVENTS.put(("press", value))
+
+  def handle_press(value):
     # v.toggle()
-    mpdObj.togglePause()
-    print("Toggled pause: {}".format(mpdObj.client.status()['state']))
-    EVENT.set()
+    # Batch the pause toggle and the status read into one command list, so
+    # a press costs a single socket round-trip instead of two. If the
+    # socket went stale (mpd restart, dropped connection), reconnect and
+    # retry once rather than letting the error kill the dispatch loop.
+    for attempt in range(2):
+      try:
+        with mpd_lock:
+          client = mpdObj.client
+          client.command_list_ok_begin()
+          client.pause()
+          client.status()
+          results = client.command_list_end()
+        print("Toggled pause: {}".format(results[-1]['state']))
+        return
+      except Exception:
+        logger.debug("mpd pause toggle failed", exc_info=True)
+        if attempt or not mpd_reconnect():
+          return
 
   def on_button_press(channel):
     print("Button callback {}".format(channel))
-    logging.debug("Button callback {}".format(channel))
-    NavQueue.put(channel)
-    EVENT.set()
+    # %s-style arguments are only formatted if DEBUG logging is actually
+    # enabled, so this costs nothing in production.
+    logger.debug("Button callback %s", channel)
+    EVENTS.put(("button", channel))
 
   # This callback runs in the background thread. All it does is put turn
-  # events into a queue and flag the main thread to process them. The
-  # queueing ensures that we won't miss anything if the knob is turned
-  # extremely quickly.
+  # events into the queue for the main thread to process. The queueing
+  # ensures that we won't miss anything if the knob is turned extremely
+  # quickly.
   def on_turn(delta):
-    RotEncQUEUE.put(delta)
-    EVENT.set()
+    EVENTS.put(("turn", delta))
 
-  def consume_queue():
-    while not RotEncQUEUE.empty():
-      delta = RotEncQUEUE.get()
-      handle_delta(delta)
-    while not NavQueue.empty():
-      button = NavQueue.get()
-      handle_button(button)
+  # Monotonic timestamp of the last processed turn event, for the
+  # acceleration curve in handle_delta.
+  last_tick = 0.0
 
   def handle_delta(delta):
+    nonlocal last_tick
     if v.is_muted:
-      debug("Unmuting")
+      if DEBUG:
+        debug("Unmuting")
       v.toggle()
-    if delta == 1:
-      vol = v.up()
+    # Scale the step by how fast the knob is being turned. A quick spin
+    # should sweep the volume range instead of crawling one increment per
+    # detent, and covering the same distance in fewer steps also means
+    # fewer mixer writes per gesture.
+    now = time.monotonic()
+    dt = now - last_tick
+    last_tick = now
+    if dt < 0.03:
+      mult = 4
+    elif dt < 0.08:
+      mult = 2
     else:
-      vol = v.down()
+      mult = 1
+    vol = v.change(delta * mult * v.INCREMENT)
     print("Set volume to: {}".format(vol))
 
   def handle_button(button):
-    logging.debug('Button pressed: {}'.format(button))
-    if button == GPIO_BT_RIGHT:
-      print("Right")
-      mpdObj.next()
-    elif button == GPIO_BT_LEFT:
-      print("Left")
-      mpdObj.prev()
-    elif button == GPIO_BT_UP:
-      print("Up")
-      mpdObj.prevplaylist()
-    elif button == GPIO_BT_DOWN:
-      print("Down")
-      mpdObj.nextplaylist()
-
-  def on_exit(a, b):
+    logger.debug('Button pressed: %s', button)
+    try:
+      with mpd_lock:
+        if button == GPIO_BT_RIGHT:
+          print("Right")
+          mpdObj.next()
+        elif button == GPIO_BT_LEFT:
+          print("Left")
+          mpdObj.prev()
+        elif button == GPIO_BT_UP:
+          print("Up")
+          mpdObj.prevplaylist()
+        elif button == GPIO_BT_DOWN:
+          print("Down")
+          mpdObj.nextplaylist()
+    except Exception:
+      # Same stale-socket story as handle_press: swallow the error and get
+      # a fresh connection so the next press works.
+      logger.debug("mpd command failed", exc_info=True)
+      mpd_reconnect()
+
+  def handle_exit(signum):
     print("Exiting...")
     encoder.destroy()
     navbuttons.destroy()
+    # Flush any log records still sitting in the queue before we go.
+    listener.stop()
     sys.exit(0)
 
-  debug("Volume knob using pins {} and {}".format(gpioA, gpioB))
+  def on_exit(signum, frame):
+    # Push a sentinel instead of tearing down here: the GPIO callbacks also
+    # go through the queue, so exiting from the main loop keeps the teardown
+    # out of signal-handler context and wakes the blocking get() immediately.
+    EVENTS.put(("exit", signum))
+
+  if DEBUG:
+    debug("Volume knob using pins {} and {}".format(gpioA, gpioB))
 
-  if gpioButton != None:
-    debug("Volume button using pin {}".format(gpioButton))
+    if gpioButton != None:
+      debug("Volume button using pin {}".format(gpioButton))
 
   # debug("Initial volume: {}".format(v.volume))
 
@@ -398,20 +654,49 @@ def main():
   signal.signal(signal.SIGINT, on_exit)
   signal.signal(signal.SIGTERM, on_exit)
 
+  dispatch = {
+    "turn": handle_delta,
+    "button": handle_button,
+    "press": handle_press,
+    "exit": handle_exit,
+  }
+
   while True:
-    # This is the best way I could come up with to ensure that this script
-    # runs indefinitely without wasting CPU by polling. The main thread will
-    # block quietly while waiting for the event to get flagged. When the knob
-    # is turned we're able to respond immediately, but when it's not being
-    # turned we're not looping at all.
-    #
-    # The 1200-second (20 minute) timeout is a hack; for some reason, if I
-    # don't specify a timeout, I'm unable to get the SIGINT handler above to
-    # work properly. But if there is a timeout set, even if it's a very long
-    # timeout, then Ctrl-C works as intended. No idea why.
-    EVENT.wait(1200)
-    consume_queue()
-    EVENT.clear()
+    # The main thread blocks quietly on the queue while waiting for the
+    # callback threads to push something. When the knob is turned we're able
+    # to respond immediately, but when it's not being turned we're not
+    # looping at all. Ctrl-C works without any timeout hack because the
+    # signal handler pushes an "exit" sentinel through the same queue.
+    batch = [EVENTS.get()]
+
+    # Drain whatever piled up while we were busy, so a burst costs one pass
+    # through the loop instead of one wakeup per event.
+    try:
+      while True:
+        batch.append(EVENTS.get_nowait())
+    except queue.Empty:
+      pass
+
+    total = 0
+    previous = None
+    for kind, payload in batch:
+      if kind == "turn":
+        # Coalesce queued ticks: N deltas become one mixer write. Order
+        # relative to other events is preserved because the running total
+        # is flushed before anything else is dispatched.
+        total += payload
+        continue
+      if total:
+        handle_delta(total)
+        total = 0
+      if kind == "button" and (kind, payload) == previous:
+        # A bouncing button queues identical events back to back; acting
+        # on the first one is enough.
+        continue
+      previous = (kind, payload)
+      dispatch[kind](payload)
+    if total:
+      handle_delta(total)
 
 
 